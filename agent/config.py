@@ -1,4 +1,8 @@
 import os
+from dotenv import load_dotenv
+
+# Load .env before any setting below reads the environment (config is imported before main.py's load_dotenv)
+load_dotenv()
 
 # Agent Configuration
 
@@ -18,3 +22,40 @@ HEADLESS = False  # Set to True for server environments
 VIEWPORT = {"width": 1280, "height": 800}
 MAX_STEPS = 10
 SELF_HEALING_THRESHOLD = 0.01 # 1% pixel change required to consider action successful
+
+# Network Filtering (ads/trackers/heavy resources are not needed to decide where to click)
+NETWORK_FILTER_ENABLED = os.getenv("NETWORK_FILTER_ENABLED", "true").lower() == "true"
+BLOCKED_RESOURCE_TYPES = ["font", "media"]
+BLOCKED_DOMAINS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "scorecardresearch.com",
+    "hotjar.com",
+    "segment.io",
+    "mixpanel.com",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+]
+BLOCKED_URL_PATTERNS = [
+    r"/(ads|adserver|pagead)/",
+    r"/(beacon|collect|pixel|track(ing)?)(\?|/|$)",
+    r"\.(woff2?|ttf|otf|eot)(\?|$)",
+]
+
+# Local static-asset cache (shared across sessions)
+ASSET_CACHE_DIR = os.getenv("ASSET_CACHE_DIR", ".omniact_cache/assets")  # Empty string disables caching
+CACHEABLE_RESOURCE_TYPES = ["stylesheet", "script", "image"]
+ASSET_CACHE_TTL = 24 * 3600  # Upper bound in seconds; responses without Cache-Control/Expires/Last-Modified are not cached
+ASSET_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Oldest entries are evicted at session start beyond this; None = no cap
+
+# Tool Execution
+TOOL_WORKERS = 4  # Threads for blocking tool I/O, kept off the browser event loop
+TOOL_TIMEOUT = 30  # Seconds per tool call
+READ_CHUNK_SIZE = 16 * 1024  # Bytes returned per read_file page
+TOOL_RESULTS_IN_PROMPT = 4  # Most recent tool results shown to the VLM on each step
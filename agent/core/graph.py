@@ -6,7 +6,7 @@ from .state import AgentState
 from .perception import capture_interactive_elements, annotate_screenshot, get_page_text_map
 from .llm import VLMAgent
 from .executor import ActionEngine
-from .system_ops import SystemTools
+from .tools import registry as tool_registry, parse_tool_calls
 from .types import InteractiveElement
 import config
 
@@ -41,7 +41,9 @@ def create_agent_graph(agent_brain: VLMAgent, executor: ActionEngine, page):
             state["objective"], 
             state["screenshot"], 
             state["elements"],
-            text_map=state.get("text_map", "")
+            text_map=state.get("text_map", ""),
+            # Without this the model never sees read_file pages, offsets or tool errors
+            tool_results=state["history"][-config.TOOL_RESULTS_IN_PROMPT:]
         )
         return {"decision": decision}
 
@@ -57,28 +59,23 @@ def create_agent_graph(agent_brain: VLMAgent, executor: ActionEngine, page):
             return {"status": "wait_for_human"}
 
         if action == "tool_use":
-            # format: tool_name|arg1...
-            parts = decision.get("value", "").split("|", 1)
-            tool_name = parts[0]
-            args = parts[1] if len(parts) > 1 else ""
-            
-            print(f"   [Tool] Invoking {tool_name}...")
-            result = "Unknown Tool"
-            
-            if tool_name == "write_file":
-                # split args into filename|content
-                f_parts = args.split("|", 1)
-                if len(f_parts) == 2:
-                    result = SystemTools.write_file(f_parts[0], f_parts[1])
-                else:
-                    result = "Error: write_file requires 'filename|content'"
-            
-            elif tool_name == "read_file":
-                result = SystemTools.read_file(args)
-                
-            print(f"   [Tool Result] {result}")
+            calls = parse_tool_calls(decision)
+            print(f"   [Tool] Invoking {', '.join(c['name'] for c in calls)}...")
+
+            # Independent calls in one decision run concurrently, off the browser event loop
+            results = await tool_registry.call_many(calls)
+
+            for call, result in zip(calls, results):
+                # Console echo only; the full result goes to history for the prompt
+                shown = str(result)
+                if len(shown) > 2000:
+                    shown = shown[:2000] + f"... [{len(shown) - 2000} more chars]"
+                print(f"   [Tool Result] {call['name']}: {shown}")
+            history = state["history"] + [
+                {"tool": c["name"], "args": c.get("args", {}), "result": r} for c, r in zip(calls, results)
+            ]
             # Tool use doesn't need visual verification usually, but we keep the loop
-            return {"steps_taken": state["steps_taken"] + 1, "status": "running"}
+            return {"steps_taken": state["steps_taken"] + 1, "status": "running", "history": history}
             
         await executor.execute(decision, state["elements"])
         return {"steps_taken": state["steps_taken"] + 1, "status": "running"}
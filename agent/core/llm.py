@@ -7,6 +7,17 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from .types import InteractiveElement
 
+def format_tool_results(tool_results: List[Dict[str, Any]], max_arg_len: int = 200) -> str:
+    """Renders tool history entries for the prompt. Long arguments (e.g. written content) are trimmed, results are not."""
+    lines = []
+    for entry in tool_results:
+        args = ", ".join(
+            f"{k}={v if len(str(v)) <= max_arg_len else str(v)[:max_arg_len] + '...'}"
+            for k, v in entry.get("args", {}).items()
+        )
+        lines.append(f"- {entry['tool']}({args}) ->\n{entry['result']}")
+    return "\n".join(lines)
+
 class VLMAgent:
     def __init__(self, provider: str = "mock", model_name: str = ""):
         self.provider = provider
@@ -21,48 +32,52 @@ class VLMAgent:
         else:
             self.llm = None # Mock mode
 
-        async def reason(self, objective: str, screenshot_base64: str, elements: List[InteractiveElement], text_map: str = "") -> Dict[str, Any]:
-            """
-            Analyzes the screenshot and elements to decide the next action.
-            """
-            
-            # 1. Prepare Element Context
-            elements_desc = "\n".join(
-                [f"ID {el.id}: <{el.tag_name}> {el.text_content} {el.attributes}" 
-                 for el in elements]
-            )
-    
-                    system_prompt = """You are an AI Agent. Complete the objective via JSON output.
-                    
-                    Actions:
-                    - Browser: "click", "type", "scroll", "hover", "navigate", "wait", "press_key"
-                    - System: "tool_use" (value format: "tool_name|arg1|arg2...")
-                    - Flow: "done", "fail"
-                    
-                    Tools Available:
-                    - "write_file|filename|content"
-                    - "read_file|filename"
-                    
-                    Output format:
-                    {
-                        "reasoning": "...",
-                        "action": "click" | "type" | ... | "tool_use",
-                        "element_id": <int> (optional for navigate/tool_use), 
-                        "value": "..." (text to type, URL, key to press, or tool arguments)
-                    }
-                    """
-                        user_text = f"Objective: {objective}\n\nVisible Interactive Elements:\n{elements_desc}"
-            if text_map:
-                user_text += f"\n\nPage Text Content (OCR-like):\n{text_map}"
-    
-            user_content = [
-                {"type": "text", "text": user_text},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{screenshot_base64}"}
-                }
-            ]
-            if self.llm:
+    async def reason(self, objective: str, screenshot_base64: str, elements: List[InteractiveElement], text_map: str = "", tool_results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Analyzes the screenshot and elements to decide the next action.
+        """
+        
+        # 1. Prepare Element Context
+        elements_desc = "\n".join(
+            [f"ID {el.id}: <{el.tag_name}> {el.text_content} {el.attributes}" 
+             for el in elements]
+        )
+
+        system_prompt = """You are an AI Agent. Complete the objective via JSON output.
+        
+        Actions:
+        - Browser: "click", "type", "scroll", "hover", "navigate", "wait", "press_key"
+        - System: "tool_use" (value format: "tool_name|arg1|arg2...", or a "tool_calls" list)
+        - Flow: "done", "fail"
+        
+        Tools Available:
+        - "write_file|filename|content"
+        - "append_file|filename|content" (write large outputs in several pieces)
+        - "read_file|filename|offset" (offset optional; long files are returned page by page)
+        
+        Output format:
+        {
+            "reasoning": "...",
+            "action": "click" | "type" | ... | "tool_use",
+            "element_id": <int> (optional for navigate/tool_use), 
+            "value": "..." (text to type, URL, key to press, or tool arguments),
+            "tool_calls": [{"name": "read_file", "args": {"filename": "...", "offset": 0}}] (optional; calls on different files run in parallel, calls on the same file run in list order)
+        }
+        """
+        user_text = f"Objective: {objective}\n\nVisible Interactive Elements:\n{elements_desc}"
+        if text_map:
+            user_text += f"\n\nPage Text Content (OCR-like):\n{text_map}"
+        if tool_results:
+            user_text += f"\n\nRecent Tool Results:\n{format_tool_results(tool_results)}"
+
+        user_content = [
+            {"type": "text", "text": user_text},
+            {
+                "type": "image_url",
+                "image_url": {"url": f"data:image/png;base64,{screenshot_base64}"}
+            }
+        ]
+        if self.llm:
             try:
                 message = HumanMessage(content=user_content)
                 response = await self.llm.ainvoke([SystemMessage(content=system_prompt), message])
@@ -0,0 +1,299 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Iterable, Optional
+from urllib.parse import urlsplit
+from playwright.async_api import BrowserContext, Route
+
+# Hop-by-hop / encoding headers that no longer describe the (already decoded) cached body,
+# plus cookies, which must never be replayed into later sessions
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+# Cache-Control directives that make a response unsafe to share across sessions
+_UNCACHEABLE_DIRECTIVES = {"no-store", "no-cache", "private"}
+
+def _parse_http_date(value: str) -> Optional[float]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)  # HTTP dates are always GMT
+    return parsed.timestamp()
+
+class NetworkFilter:
+    """
+    Intercepts every request on a Playwright context.
+    Blocks ads/trackers/heavy resources and serves repeated static assets from an on-disk cache.
+
+    Tradeoff: routing a context disables Chromium's own HTTP cache for it, and every request
+    takes an extra hop through Python. Requests that are neither blocked nor served from disk
+    ("passed_through" in the report) pay that cost, so the report shows both sides.
+    """
+
+    def __init__(
+        self,
+        blocked_resource_types: Iterable[str] = (),
+        blocked_domains: Iterable[str] = (),
+        blocked_url_patterns: Iterable[str] = (),
+        cache_dir: Optional[str] = None,
+        cacheable_resource_types: Iterable[str] = ("stylesheet", "script", "image"),
+        cache_ttl: Optional[float] = None,
+        cache_max_bytes: Optional[int] = None,
+    ):
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.blocked_domains = {d.lower().lstrip(".") for d in blocked_domains}
+        self.blocked_url_patterns = [re.compile(p) for p in blocked_url_patterns]
+        self.cache_dir = cache_dir
+        self.cacheable_resource_types = set(cacheable_resource_types)
+        self.cache_ttl = cache_ttl
+        self.cache_max_bytes = cache_max_bytes
+        self.stats = {
+            "requests_total": 0,
+            "requests_blocked": 0,
+            "requests_from_cache": 0,
+            "bytes_from_cache": 0,
+            "requests_passed_through": 0,
+            "assets_cached": 0,
+        }
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        """False when there is nothing to block or cache; routing would then only cost the HTTP cache."""
+        return bool(self.blocked_resource_types or self.blocked_domains or self.blocked_url_patterns or self.cache_dir)
+
+    async def attach(self, context: BrowserContext) -> bool:
+        """Installs the interception handler on all pages of the context. Returns False if it had nothing to do."""
+        if not self.enabled:
+            return False
+        if self.cache_dir:
+            await asyncio.to_thread(self.sweep)
+        await context.route("**/*", self._handle)
+        return True
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.blocked_resource_types:
+            return True
+
+        # Pages the agent navigates to are never blocked by domain/pattern, only their subresources
+        if resource_type == "document":
+            return False
+
+        host = (urlsplit(url).hostname or "").lower()
+        if any(host == d or host.endswith("." + d) for d in self.blocked_domains):
+            return True
+
+        return any(p.search(url) for p in self.blocked_url_patterns)
+
+    async def _handle(self, route: Route):
+        request = route.request
+        self.stats["requests_total"] += 1
+
+        if self.should_block(request.url, request.resource_type):
+            self.stats["requests_blocked"] += 1
+            await route.abort("blockedbyclient")
+            return
+
+        if not self._is_cacheable(request.method, request.resource_type):
+            self.stats["requests_passed_through"] += 1
+            await route.continue_()
+            return
+
+        key = self._cache_key(request.url)
+        cached = await asyncio.to_thread(self._load, key)
+        if cached:
+            meta, body = cached
+            self.stats["requests_from_cache"] += 1
+            self.stats["bytes_from_cache"] += len(body)
+            await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+            return
+
+        self.stats["requests_passed_through"] += 1
+        try:
+            response = await route.fetch()
+        except Exception:
+            # Let the browser surface the network error itself
+            await route.continue_()
+            return
+
+        body = await response.body()
+        headers = response.headers
+        ttl = self._cache_lifetime(headers) if response.status == 200 else 0
+        if ttl > 0:
+            try:
+                await asyncio.to_thread(self._store, key, request.url, response.status, headers, body, ttl)
+                self.stats["assets_cached"] += 1
+            except OSError as e:
+                print(f"[Network] Could not cache {request.url}: {e}")
+        await route.fulfill(response=response, body=body)
+
+    def _is_cacheable(self, method: str, resource_type: str) -> bool:
+        return bool(self.cache_dir) and method == "GET" and resource_type in self.cacheable_resource_types
+
+    def _cache_lifetime(self, headers: Dict[str, str]) -> float:
+        """
+        Seconds a response may be kept, or 0 if it must not be cached.
+        Honours Cache-Control, Expires, Last-Modified and Vary; the configured TTL is an upper bound.
+        """
+        directives = {}
+        for part in headers.get("cache-control", "").lower().split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name] = value.strip('" ')
+
+        if _UNCACHEABLE_DIRECTIVES & directives.keys():
+            return 0
+
+        # The cache is keyed by URL only, so anything varying on request headers is unsafe
+        vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+        if vary - {"accept-encoding"}:
+            return 0
+
+        max_age = directives.get("s-maxage") or directives.get("max-age")
+        if max_age is not None:
+            try:
+                lifetime = max(int(max_age), 0)
+            except ValueError:
+                return 0
+        elif "expires" in headers:
+            expires = _parse_http_date(headers["expires"])
+            if expires is None:
+                return 0  # Invalid Expires means "already expired"
+            lifetime = max(expires - (_parse_http_date(headers.get("date", "")) or time.time()), 0)
+        elif "last-modified" in headers:
+            # RFC 9111 heuristic freshness: 10% of the time since the asset last changed
+            last_modified = _parse_http_date(headers["last-modified"])
+            if last_modified is None:
+                return 0
+            lifetime = max((_parse_http_date(headers.get("date", "")) or time.time()) - last_modified, 0) * 0.1
+        else:
+            return 0  # No freshness information at all: don't replay it across sessions
+
+        return lifetime if self.cache_ttl is None else min(self.cache_ttl, lifetime)
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".bin"
+
+    def _load(self, key: str):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if time.time() > meta["expires_at"]:
+                # Stale entries for URLs that are never requested again are removed by sweep()
+                self._remove(meta_path, body_path)
+                return None
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes, ttl: float):
+        meta_path, body_path = self._paths(key)
+        stored_at = time.time()
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "stored_at": stored_at,
+            "expires_at": stored_at + ttl,
+        }
+        # Body first, then metadata: an entry is only visible once both are on disk
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _write_atomic(self, path: str, data: bytes):
+        # Unique temp name: pages/sessions sharing the cache dir may store the same URL at once
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _remove(*paths: str):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def sweep(self):
+        """
+        Deletes expired entries and leftover temp files, then evicts the oldest entries
+        until the cache fits in cache_max_bytes. Runs once per session on attach().
+        """
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith(".tmp"):
+                # Abandoned by a crashed writer (live writers replace theirs within milliseconds)
+                try:
+                    if now - os.path.getmtime(path) > 3600:
+                        self._remove(path)
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".json"):
+                continue
+
+            meta_path, body_path = self._paths(name[:-len(".json")])
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                expired = now > meta["expires_at"]
+                size = os.path.getsize(body_path)
+            except (OSError, ValueError, KeyError, TypeError):
+                expired, size, meta = True, 0, {}
+            if expired:
+                self._remove(meta_path, body_path)
+            else:
+                entries.append((meta.get("stored_at", 0), size, meta_path, body_path))
+
+        # Orphaned bodies (metadata write never happened)
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".bin") and not os.path.exists(os.path.join(self.cache_dir, name[:-len(".bin")] + ".json")):
+                self._remove(os.path.join(self.cache_dir, name))
+
+        if self.cache_max_bytes is not None:
+            total = sum(size for _, size, _, _ in entries)
+            for _, size, meta_path, body_path in sorted(entries):
+                if total <= self.cache_max_bytes:
+                    break
+                self._remove(meta_path, body_path)
+                total -= size
+
+    def report(self) -> Dict[str, Any]:
+        """Per-session counts of requests and bytes saved."""
+        return dict(self.stats)
+
+    def print_report(self):
+        s = self.stats
+        print("\n[Network] Session summary")
+        print(f"          Requests seen:      {s['requests_total']}")
+        print(f"          Requests blocked:   {s['requests_blocked']}")
+        print(f"          Served from cache:  {s['requests_from_cache']} ({s['bytes_from_cache']} bytes saved)")
+        print(f"          New assets cached:  {s['assets_cached']}")
+        saved = s["requests_blocked"] + s["requests_from_cache"]
+        print(f"          Passed through:     {s['requests_passed_through']} (no browser HTTP cache while routing)")
+        print(f"          Net: {saved} of {s['requests_total']} requests never hit the network")
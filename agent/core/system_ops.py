@@ -1,31 +1,77 @@
+import mmap
 import os
 
+import config
+
 class SystemTools:
     """
     Provides local system capabilities to the Agent.
+    These are blocking calls; the agent runs them through the ToolRegistry thread pool.
     """
-    
+
     @staticmethod
-    def write_file(filename: str, content: str) -> str:
-        """Saves content to a file in the workspace."""
+    def _check_path(filename: str):
+        # Security: Prevent traversing out of workspace (simple check)
+        if not filename or ".." in filename or filename.startswith("/"):
+            return "Error: Access denied. Relative paths only."
+        return None
+
+    @staticmethod
+    def write_file(filename: str, content: str, append: bool = False) -> str:
+        """Saves content to a file in the workspace. With append=True, large outputs can be streamed in pieces."""
         try:
-            # Security: Prevent traversing out of workspace (simple check)
-            if ".." in filename or filename.startswith("/"):
-                return "Error: Access denied. Relative paths only."
-                
-            with open(filename, "w", encoding="utf-8") as f:
+            error = SystemTools._check_path(filename)
+            if error:
+                return error
+
+            with open(filename, "a" if append else "w", encoding="utf-8") as f:
                 f.write(content)
-            return f"Success: Written to {filename}"
+            verb = "Appended" if append else "Written"
+            return f"Success: {verb} {len(content)} chars to {filename}"
         except Exception as e:
             return f"Error writing file: {e}"
 
     @staticmethod
-    def read_file(filename: str) -> str:
-        """Reads content from a file."""
+    def read_file(filename: str, offset: int = 0, length: int = config.READ_CHUNK_SIZE) -> str:
+        """
+        Reads one page of a file, starting at byte `offset`.
+        Appends a marker with the next offset when the file continues, instead of silently truncating.
+        """
         try:
+            error = SystemTools._check_path(filename)
+            if error:
+                return error
             if not os.path.exists(filename):
                 return "Error: File not found."
-            with open(filename, "r", encoding="utf-8") as f:
-                return f.read(2000) # Limit size
+
+            offset, length = max(int(offset), 0), max(int(length), 1)
+            with open(filename, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if offset >= size:
+                    return "" if size == 0 else f"Error: Offset {offset} is past end of file ({size} bytes)."
+
+                limit = min(offset + length, size)
+                # One byte past the page so the UTF-8 boundary check below can see it
+                try:
+                    # mmap pages in only the requested window instead of reading the whole file
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        window = mm[offset:limit + 1]
+                except (OSError, ValueError):
+                    # Not mappable (special files, some filesystems): plain seek/read
+                    f.seek(offset)
+                    window = f.read(limit + 1 - offset)
+
+            end = limit - offset
+            # Don't split a UTF-8 sequence across pages
+            while end < len(window) and end > 0 and (window[end] & 0xC0) == 0x80:
+                end -= 1
+            if end == 0:
+                end = limit - offset
+            text = window[:end].decode("utf-8", errors="replace")
+            end += offset
+
+            if end < size:
+                text += f"\n[... {size - end} more bytes. Continue with offset={end}]"
+            return text
         except Exception as e:
             return f"Error reading file: {e}"
@@ -1,28 +1,126 @@
-from typing import Dict, Any
+import asyncio
+import functools
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from .system_ops import SystemTools
+import config
 
 class ToolRegistry:
-    def __init__(self):
+    """
+    Async tool execution for the agent.
+    Sync tools run in a dedicated thread pool so file I/O never blocks the browser loop.
+    """
+
+    def __init__(self, max_workers: int = config.TOOL_WORKERS, default_timeout: float = config.TOOL_TIMEOUT):
         self.tools = {}
+        self.timeouts = {}
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="omniact-tool")
 
-    def register(self, name: str, func):
+    def register(self, name: str, func, timeout: Optional[float] = None):
         self.tools[name] = func
+        self.timeouts[name] = timeout or self.default_timeout
 
     async def call(self, name: str, args: Dict[str, Any]) -> str:
         if name not in self.tools:
             return f"Error: Tool {name} not found."
+        func = self.tools[name]
+        timeout = self.timeouts[name]
         try:
-            return await self.tools[name](**args)
+            if inspect.iscoroutinefunction(func):
+                coro = func(**args)
+            else:
+                loop = asyncio.get_running_loop()
+                coro = loop.run_in_executor(self._executor, functools.partial(func, **args))
+            # Note: a timed-out sync tool keeps running in its thread; only the agent stops waiting
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            return f"Error: Tool {name} timed out after {timeout}s."
         except Exception as e:
             return f"Error calling tool {name}: {str(e)}"
 
-# Example Tool: Read File
-async def read_local_file(path: str):
-    import os
-    if not os.path.exists(path):
-        return f"File {path} not found."
-    with open(path, 'r') as f:
-        return f.read(1000) # Limit to 1000 chars
+    async def call_many(self, calls: List[Dict[str, Any]]) -> List[str]:
+        """
+        Runs tool calls from one decision concurrently; results keep the order of `calls`.
+        Calls on the same file run one after another in list order, so e.g. successive appends don't interleave.
+        Once a call on a file fails or times out, the rest of that file's calls are skipped.
+        """
+        results = [None] * len(calls)
+        chains = {}
+        for i, c in enumerate(calls):
+            path = c.get("args", {}).get("filename")
+            # Calls without a target path are independent of everything else
+            chains.setdefault(os.path.normpath(str(path)) if path else ("call", i), []).append(i)
+
+        async def run_chain(key, indices):
+            failed = False
+            for i in indices:
+                c = calls[i]
+                if failed:
+                    # A timed-out tool may still be running in its thread; starting the next call
+                    # on the same file would race with it
+                    results[i] = f"Error: skipped, earlier call on {key} failed or did not finish."
+                elif "error" in c:  # Malformed call, reported by parse_tool_calls
+                    results[i] = c["error"]
+                    failed = True
+                else:
+                    results[i] = await self.call(c["name"], c.get("args", {}))
+                    failed = str(results[i]).startswith("Error")
+
+        await asyncio.gather(*(run_chain(key, indices) for key, indices in chains.items()))
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+def _parse_structured_call(c: Any) -> Dict[str, Any]:
+    if not isinstance(c, dict):
+        return {"name": str(c), "args": {}, "error": f"Error: tool call must be an object like {{\"name\": ..., \"args\": {{...}}}}, got {c!r}"}
+    name = c.get("name")
+    if not isinstance(name, str) or not name:
+        return {"name": str(name), "args": {}, "error": f"Error: tool call is missing a 'name': {c!r}"}
+    args = c.get("args") or {}
+    if not isinstance(args, dict):
+        return {"name": name, "args": {}, "error": f"Error: 'args' for {name} must be an object, got {args!r}"}
+    return {"name": name, "args": args}
+
+def parse_tool_calls(decision: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extracts tool calls from a VLM decision.
+    Accepts the structured form {"tool_calls": [{"name": ..., "args": {...}}]}
+    and the legacy "tool_name|arg1|arg2" string in "value".
+    """
+    if decision.get("tool_calls"):
+        tool_calls = decision["tool_calls"]
+        if not isinstance(tool_calls, list):
+            tool_calls = [tool_calls]
+        return [_parse_structured_call(c) for c in tool_calls]
+
+    parts = str(decision.get("value") or "").split("|", 1)
+    tool_name = parts[0]
+    args = parts[1] if len(parts) > 1 else ""
+
+    if tool_name in ("write_file", "append_file"):
+        # split args into filename|content
+        f_parts = args.split("|", 1)
+        if len(f_parts) != 2:
+            return [{"name": tool_name, "args": {}, "error": f"Error: {tool_name} requires 'filename|content'"}]
+        return [{"name": tool_name, "args": {"filename": f_parts[0], "content": f_parts[1]}}]
+
+    if tool_name == "read_file":
+        # filename|offset (offset optional, for paging through large files)
+        f_parts = args.split("|", 1)
+        call_args = {"filename": f_parts[0]}
+        if len(f_parts) == 2 and f_parts[1].strip().isdigit():
+            call_args["offset"] = int(f_parts[1])
+        return [{"name": tool_name, "args": call_args}]
+
+    return [{"name": tool_name, "args": {}}]
 
 # Initialize Registry
 registry = ToolRegistry()
-registry.register("read_file", read_local_file)
+registry.register("read_file", SystemTools.read_file)
+registry.register("write_file", SystemTools.write_file)
+registry.register("append_file", functools.partial(SystemTools.write_file, append=True))
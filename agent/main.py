@@ -6,6 +6,8 @@ from playwright.async_api import async_playwright
 from core.llm import VLMAgent
 from core.executor import ActionEngine
 from core.graph import create_agent_graph
+from core.network import NetworkFilter
+from core.tools import registry as tool_registry
 from dotenv import load_dotenv
 import config
 import os
@@ -30,6 +32,23 @@ async def main():
         # Launch Browser
         browser = await p.chromium.launch(headless=config.HEADLESS)
         context = await browser.new_context(viewport=config.VIEWPORT)
+
+        # Drop ads/trackers/fonts/media and serve repeated static assets from disk
+        network_filter = None
+        if config.NETWORK_FILTER_ENABLED:
+            network_filter = NetworkFilter(
+                blocked_resource_types=config.BLOCKED_RESOURCE_TYPES,
+                blocked_domains=config.BLOCKED_DOMAINS,
+                blocked_url_patterns=config.BLOCKED_URL_PATTERNS,
+                cache_dir=config.ASSET_CACHE_DIR or None,
+                cacheable_resource_types=config.CACHEABLE_RESOURCE_TYPES,
+                cache_ttl=config.ASSET_CACHE_TTL,
+                cache_max_bytes=config.ASSET_CACHE_MAX_BYTES,
+            )
+            # Routing disables the browser's HTTP cache, so it is skipped when there is nothing to block or cache
+            if not await network_filter.attach(context):
+                network_filter = None
+
         page = await context.new_page()
         
         executor = ActionEngine(page)
@@ -63,9 +82,12 @@ async def main():
         result = await agent_graph.ainvoke(initial_state, config=run_config)
         
         print(f"\n>>> Task Finished with status: {result['status']}")
+        if network_filter:
+            network_filter.print_report()
         
         await asyncio.sleep(2)
         await browser.close()
+        tool_registry.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
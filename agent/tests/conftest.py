@@ -0,0 +1,5 @@
+import os
+import sys
+
+# agent/main.py runs as a script, so `core` and `config` are top-level imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
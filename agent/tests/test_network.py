@@ -0,0 +1,281 @@
+import asyncio
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from core.network import NetworkFilter
+
+PAGE = """<html><head>
+<link rel="stylesheet" href="/style.css">
+<script src="/ads/banner.js"></script>
+<script src="http://localhost:{port}/app.js"></script>
+<script src="/private.js"></script>
+</head><body><a href="/tracking/">Track</a></body></html>"""
+
+ASSETS = {
+    "/style.css": ("text/css", {"Cache-Control": "public, max-age=3600"}, "body { color: red; }"),
+    "/ads/banner.js": ("application/javascript", {"Cache-Control": "max-age=3600"}, "window.ad = 1;"),
+    "/app.js": ("application/javascript", {"Cache-Control": "max-age=3600"}, "window.app = 1;"),
+    "/private.js": ("application/javascript", {"Cache-Control": "private, max-age=3600"}, "window.me = 1;"),
+    "/plain.js": ("application/javascript", {}, "window.plain = 1;"),
+    "/expires.js": ("application/javascript", {"Expires": formatdate(time.time() + 3600, usegmt=True)}, "window.e = 1;"),
+    "/expired.js": ("application/javascript", {"Expires": formatdate(time.time() - 60, usegmt=True)}, "window.x = 1;"),
+}
+
+@pytest.fixture
+def fixture_server():
+    """Local static site; counts how often each path actually reaches the server."""
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] += 1
+            if self.path in ("/", "/index.html", "/tracking/"):
+                content_type, headers = "text/html", {"Cache-Control": "no-store"}
+                body = PAGE.format(port=self.server.server_port)
+            elif self.path in ASSETS:
+                content_type, headers, body = ASSETS[self.path]
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Set-Cookie", "session=secret")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+    server.server_close()
+
+def make_filter(cache_dir):
+    return NetworkFilter(
+        blocked_resource_types=["font", "media"],
+        blocked_domains=["localhost"],
+        blocked_url_patterns=[r"/(ads|adserver|pagead)/", r"/(beacon|collect|pixel|track(ing)?)(\?|/|$)"],
+        cache_dir=str(cache_dir),
+        cache_ttl=24 * 3600,
+    )
+
+# --- Minimal stand-in for playwright's Route, backed by real HTTP to the fixture server ---
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = "GET"
+
+class FakeResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+        self.fulfilled = None
+
+    async def fetch(self):
+        with urllib.request.urlopen(self.request.url) as r:
+            return FakeResponse(r.status, {k.lower(): v for k, v in r.headers.items()}, r.read())
+
+    async def abort(self, error_code=None):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+        try:
+            urllib.request.urlopen(self.request.url).read()
+        except urllib.error.HTTPError:
+            pass
+
+    async def fulfill(self, status=None, headers=None, body=None, response=None):
+        self.outcome = "fulfilled"
+        self.fulfilled = {"status": status or response.status, "headers": headers, "body": body}
+
+def handle(network_filter, url, resource_type):
+    route = FakeRoute(url, resource_type)
+    asyncio.run(network_filter._handle(route))
+    return route
+
+def test_navigation_is_never_blocked_by_domain_or_pattern(tmp_path):
+    nf = make_filter(tmp_path)
+    for url in ("https://www.ups.com/track?tracknum=1Z", "https://example.com/tracking/", "http://localhost/"):
+        assert not nf.should_block(url, "document")
+        assert nf.should_block(url, "script")
+    assert nf.should_block("https://example.com/font.woff2", "font")
+
+def test_blocked_domain_and_pattern_are_aborted(fixture_server, tmp_path):
+    base, hits = fixture_server
+    nf = make_filter(tmp_path)
+    port = base.rsplit(":", 1)[1]
+
+    assert handle(nf, f"{base}/ads/banner.js", "script").outcome == "aborted"
+    assert handle(nf, f"http://localhost:{port}/app.js", "script").outcome == "aborted"
+    assert handle(nf, f"{base}/tracking/", "document").outcome == "continued"
+    assert hits["/ads/banner.js"] == 0 and hits["/app.js"] == 0
+    assert nf.report()["requests_blocked"] == 2
+
+def test_second_load_is_served_from_cache(fixture_server, tmp_path):
+    base, hits = fixture_server
+
+    first = handle(make_filter(tmp_path), f"{base}/style.css", "stylesheet")
+    assert first.outcome == "fulfilled"
+
+    # New filter on the same dir: the cache is shared across sessions
+    nf = make_filter(tmp_path)
+    second = handle(nf, f"{base}/style.css", "stylesheet")
+    assert second.fulfilled["body"] == b"body { color: red; }"
+    assert "set-cookie" not in {k.lower() for k in second.fulfilled["headers"]}
+    assert hits["/style.css"] == 1
+
+    report = nf.report()
+    assert report["requests_total"] == 1
+    assert report["requests_from_cache"] == 1
+    assert report["bytes_from_cache"] == len(b"body { color: red; }")
+    assert report["assets_cached"] == 0
+
+def test_private_responses_are_not_cached(fixture_server, tmp_path):
+    base, hits = fixture_server
+    nf = make_filter(tmp_path)
+    handle(nf, f"{base}/private.js", "script")
+    handle(nf, f"{base}/private.js", "script")
+    assert hits["/private.js"] == 2
+    assert nf.report()["assets_cached"] == 0
+    assert not os.listdir(tmp_path)
+
+@pytest.mark.parametrize("path, cached", [
+    ("/plain.js", False),
+    ("/expires.js", True),
+    ("/expired.js", False),
+])
+def test_freshness_headers_decide_caching(fixture_server, tmp_path, path, cached):
+    base, hits = fixture_server
+    nf = make_filter(tmp_path)
+    handle(nf, f"{base}{path}", "script")
+    handle(nf, f"{base}{path}", "script")
+    assert hits[path] == (1 if cached else 2)
+    assert nf.report()["requests_from_cache"] == (1 if cached else 0)
+
+def test_report_counts_passed_through_requests(fixture_server, tmp_path):
+    base, _ = fixture_server
+    nf = make_filter(tmp_path)
+    handle(nf, f"{base}/index.html", "document")
+    handle(nf, f"{base}/style.css", "stylesheet")
+    handle(nf, f"{base}/style.css", "stylesheet")
+    handle(nf, f"{base}/ads/banner.js", "script")
+
+    report = nf.report()
+    assert report["requests_total"] == 4
+    assert report["requests_passed_through"] == 2  # the page and the first style.css fetch
+    assert report["requests_blocked"] + report["requests_from_cache"] == 2
+
+class RecordingContext:
+    def __init__(self):
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+def test_attach_skips_routing_when_there_is_nothing_to_do(tmp_path):
+    context = RecordingContext()
+    assert asyncio.run(NetworkFilter().attach(context)) is False
+    assert context.routes == []
+
+    assert asyncio.run(make_filter(tmp_path).attach(context)) is True
+    assert context.routes == ["**/*"]
+
+def test_sweep_removes_expired_and_caps_size(fixture_server, tmp_path):
+    base, _ = fixture_server
+    nf = make_filter(tmp_path)
+    handle(nf, f"{base}/style.css", "stylesheet")
+    handle(nf, f"{base}/expires.js", "script")
+    assert len(os.listdir(tmp_path)) == 4
+
+    # Cache-busted URL that will never be requested again, already stale
+    stale = make_filter(tmp_path)
+    stale.cache_ttl = 0.01
+    handle(stale, f"{base}/style.css?v=1", "stylesheet")
+    (tmp_path / "orphan.bin").write_bytes(b"x")
+    asyncio.run(asyncio.sleep(0.05))
+
+    nf.sweep()
+    assert len(os.listdir(tmp_path)) == 4
+
+    nf.cache_max_bytes = len(b"window.e = 1;")
+    nf.sweep()
+    # Oldest entry (style.css) was evicted to fit the cap
+    assert len(os.listdir(tmp_path)) == 2
+    survivor = make_filter(tmp_path)
+    handle(survivor, f"{base}/expires.js", "script")
+    assert survivor.report()["requests_from_cache"] == 1
+
+def test_expired_entries_are_removed(fixture_server, tmp_path):
+    base, hits = fixture_server
+    nf = make_filter(tmp_path)
+    nf.cache_ttl = 0.01
+    handle(nf, f"{base}/style.css", "stylesheet")
+    assert len(os.listdir(tmp_path)) == 2
+
+    asyncio.run(asyncio.sleep(0.05))
+    nf.cache_ttl = None
+    handle(nf, f"{base}/style.css", "stylesheet")
+    assert hits["/style.css"] == 2
+    assert nf.report()["requests_from_cache"] == 0
+
+def test_browser_session_against_fixture_server(fixture_server, tmp_path):
+    from playwright.async_api import async_playwright
+
+    base, hits = fixture_server
+
+    async def load_page():
+        nf = make_filter(tmp_path)
+        async with async_playwright() as p:
+            try:
+                browser = await p.chromium.launch()
+            except Exception as e:
+                pytest.skip(f"Chromium not available: {e}")
+            context = await browser.new_context()
+            await nf.attach(context)
+            page = await context.new_page()
+            await page.goto(f"{base}/index.html")
+            await page.wait_for_load_state("networkidle")
+            await browser.close()
+        return nf.report()
+
+    first = asyncio.run(load_page())
+    second = asyncio.run(load_page())
+
+    assert first["requests_blocked"] == 2
+    assert first["assets_cached"] == 1
+    assert second["requests_from_cache"] == 1
+    # Net saving: the second session only fetches the page and the private script itself
+    assert second["requests_passed_through"] == 2
+    assert second["requests_blocked"] + second["requests_from_cache"] > second["requests_passed_through"]
+    assert hits["/style.css"] == 1
+    assert hits["/ads/banner.js"] == 0 and hits["/app.js"] == 0
+    assert hits["/private.js"] == 2
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from core import system_ops
+from core.system_ops import SystemTools
+from core.tools import ToolRegistry, parse_tool_calls, registry
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    # SystemTools only accepts relative paths
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_calls_on_same_file_run_in_list_order(workspace):
+    big = "A" * 5_000_000
+    calls = [
+        {"name": "write_file", "args": {"filename": "o.txt", "content": big}},
+        {"name": "append_file", "args": {"filename": "o.txt", "content": "B"}},
+        {"name": "append_file", "args": {"filename": "./o.txt", "content": "C"}},
+        {"name": "write_file", "args": {"filename": "other.txt", "content": "x"}},
+    ]
+    results = asyncio.run(registry.call_many(calls))
+    assert all(r.startswith("Success") for r in results)
+    assert (workspace / "o.txt").read_text() == big + "BC"
+    assert (workspace / "other.txt").read_text() == "x"
+
+def test_different_files_run_in_parallel():
+    reg = ToolRegistry()
+    running = []
+    peak = []
+
+    async def slow(filename):
+        running.append(filename)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.remove(filename)
+        return filename
+
+    reg.register("slow", slow)
+    calls = [{"name": "slow", "args": {"filename": f}} for f in ("a", "b", "a")]
+    assert asyncio.run(reg.call_many(calls)) == ["a", "b", "a"]
+    assert max(peak) == 2
+    reg.shutdown()
+
+def test_tool_timeout():
+    reg = ToolRegistry()
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    reg.register("hang", hang, timeout=0.05)
+    assert asyncio.run(reg.call("hang", {})) == "Error: Tool hang timed out after 0.05s."
+    reg.shutdown()
+
+@pytest.mark.parametrize("tool_calls", [
+    ["read_file|x"],
+    [{"name": "read_file", "args": "x"}],
+    [{"args": {"filename": "x"}}],
+    "read_file|x",
+])
+def test_malformed_tool_calls_are_reported_not_raised(tool_calls):
+    calls = parse_tool_calls({"action": "tool_use", "tool_calls": tool_calls})
+    assert len(calls) == 1 and "error" in calls[0]
+    assert asyncio.run(registry.call_many(calls))[0].startswith("Error:")
+
+def test_read_file_pages_instead_of_truncating(workspace):
+    (workspace / "big.txt").write_text("é" * 20_000, encoding="utf-8")
+
+    first = asyncio.run(registry.call("read_file", {"filename": "big.txt", "length": 1001}))
+    assert first.startswith("é" * 500)
+    assert first.endswith("Continue with offset=1000]")
+
+    calls = parse_tool_calls({"action": "tool_use", "value": "read_file|big.txt|39000"})
+    last = asyncio.run(registry.call_many(calls))[0]
+    assert last == "é" * 500
+
+def test_timed_out_sync_call_skips_rest_of_its_chain(workspace):
+    reg = ToolRegistry()
+
+    def slow_write(filename, content):
+        time.sleep(0.3)
+        with open(filename, "w") as f:
+            f.write(content)
+        return "written"
+
+    def append(filename, content):
+        with open(filename, "a") as f:
+            f.write(content)
+        return "appended"
+
+    reg.register("w", slow_write, timeout=0.1)
+    reg.register("a", append)
+    calls = [
+        {"name": "w", "args": {"filename": "o.txt", "content": "HEAD"}},
+        {"name": "a", "args": {"filename": "o.txt", "content": "TAIL"}},
+        {"name": "a", "args": {"filename": "p.txt", "content": "ok"}},
+    ]
+    results = asyncio.run(reg.call_many(calls))
+    assert results == [
+        "Error: Tool w timed out after 0.1s.",
+        "Error: skipped, earlier call on o.txt failed or did not finish.",
+        "appended",
+    ]
+    reg.shutdown()
+
+    time.sleep(0.4)  # Let the abandoned write land
+    assert (workspace / "o.txt").read_text() == "HEAD"
+
+def test_read_file_falls_back_when_mmap_fails(workspace, monkeypatch):
+    (workspace / "big.txt").write_text("é" * 2_000, encoding="utf-8")
+
+    def no_mmap(*args, **kwargs):
+        raise OSError("mmap not supported")
+
+    monkeypatch.setattr(system_ops.mmap, "mmap", no_mmap)
+    page = SystemTools.read_file("big.txt", offset=2, length=1001)
+    assert page.startswith("é" * 500)
+    assert page.endswith("Continue with offset=1002]")